@@ -1,13 +1,114 @@
 import streamlit as st
-import pandas as pd
+import io
 import json
 import re
 import os
-import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import pdfplumber
-import docx
-from typing import Dict, List, Any
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Any, Tuple, Union, IO
+
+from pdf_pages import extract_pdf_page
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Precompiled regex patterns used by the manual parser
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# One pass over the text with bounded repeats, most specific formats first;
+# candidates are filtered on digit count
+_PHONE_RE = re.compile(
+    r'(?:\(\d{3}\)\s*\d{3}[-.\s]?\d{4})'
+    r'|(?:\d{3}[-.]\d{3}[-.]\d{4})'
+    r'|(?:\+?\d[\d .()\-]{7,18}\d)'
+)
+_TITLE_RES = tuple(re.compile(p, re.IGNORECASE) for p in [
+    r'\b(senior|junior|lead|principal)\s+[a-z]+\s+[a-z]+\b',
+    r'\b(software|web|frontend|backend|full.stack|data|devops|cloud)\s+[a-z]+\b',
+    r'\b(engineer|developer|architect|analyst|scientist|manager|director)\b'
+])
+
+_WORD_RE = re.compile(r'[a-z]+')
+# Lines containing any of these words are never treated as the candidate name
+_NAME_BLACKLIST = frozenset({'resume', 'cv', 'curriculum', 'vitae', 'phone', 'email', 'linkedin'})
+
+COMMON_SKILLS = (
+    'python', 'java', 'javascript', 'html', 'css', 'react', 'angular', 'vue',
+    'node.js', 'express', 'django', 'flask', 'fastapi', 'sql', 'nosql',
+    'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker',
+    'kubernetes', 'jenkins', 'git', 'github', 'gitlab', 'ci/cd',
+    'machine learning', 'ai', 'data analysis', 'pandas', 'numpy',
+    'tensorflow', 'pytorch', 'scikit-learn', 'tableau', 'power bi',
+    'excel', 'word', 'powerpoint', 'project management', 'agile',
+    'scrum', 'jira', 'confluence', 'rest api', 'graphql', 'microservices'
+)
+
+EDUCATION_TERMS = (
+    'bachelor', 'master', 'phd', 'doctorate', 'mba', 'bs', 'ms', 'ba', 'ma',
+    'university', 'college', 'institute', 'school', 'degree', 'graduated'
+)
+
+@lru_cache(maxsize=None)
+def _skills_regex(skills: Tuple[str, ...]) -> re.Pattern:
+    """Compile a single alternation matching any of the given skills"""
+    # Longest first so "javascript" wins over "java". Lookarounds instead of \b
+    # because skills such as "node.js" and "ci/cd" contain punctuation.
+    return re.compile(
+        r'(?<![A-Za-z0-9])('
+        + '|'.join(re.escape(skill) for skill in sorted(skills, key=len, reverse=True))
+        + r')(?![A-Za-z0-9])',
+        re.IGNORECASE
+    )
+
+@lru_cache(maxsize=None)
+def _education_regex(terms: Tuple[str, ...]) -> re.Pattern:
+    """Compile a multiline regex matching whole lines that contain an education term"""
+    # Plurals and possessives ("Masters", "Bachelor's") still count as the term
+    return re.compile(r'(?im)^.*\b(?:' + '|'.join(re.escape(term) for term in terms) + r")(?:['’]?s)?\b.*$")
+
+def _build_automaton(words) -> "ahocorasick.Automaton":
+    """Build an Aho-Corasick automaton over lowercase keywords"""
+    automaton = ahocorasick.Automaton()
+    for index, word in enumerate(words):
+        automaton.add_word(word, (index, word))
+    automaton.make_automaton()
+    return automaton
+
+def _build_hyperscan_db(words) -> "hyperscan.Database":
+    """Compile keywords into a caseless Hyperscan literal database"""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(word).encode() for word in words],
+        ids=list(range(len(words))),
+        elements=len(words),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(words)
+    )
+    return db
+
+def _is_whole_token(text, start: int, end: int) -> bool:
+    """Same whole-token rule as _skills_regex, for str or bytes and an exclusive end"""
+    before, after = text[start - 1:start], text[end:end + 1]
+    # Only ASCII letters and digits join tokens, like the regex's [A-Za-z0-9] lookarounds
+    return not (before.isascii() and before.isalnum()) and not (after.isascii() and after.isalnum())
+
+# Keyword matchers for COMMON_SKILLS: Hyperscan, then pyahocorasick, then _skills_regex,
+# depending on what is installed
+_SKILL_HS = _build_hyperscan_db(COMMON_SKILLS) if hyperscan else None
+_SKILL_AC = _build_automaton(COMMON_SKILLS) if ahocorasick else None
 
 # Page configuration
 st.set_page_config(
@@ -17,8 +118,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+@st.cache_resource
+def _page_css() -> str:
+    """Custom CSS for better styling (built once per server process, not per rerun)"""
+    return """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -55,36 +158,67 @@ st.markdown("""
         color: #856404;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_page_css(), unsafe_allow_html=True)
+
+# Minimum page count before pdfplumber pages are extracted in worker processes
+PARALLEL_PAGE_THRESHOLD = 4
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF files"""
-    text = ""
+def _rewind(source: Union[str, IO[bytes]]) -> Union[str, IO[bytes]]:
+    """Reset file-like sources so every reader starts at the beginning"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+def extract_text_from_pdf(source: Union[str, IO[bytes]]) -> str:
+    """Extract text from PDF files (path or binary file-like object)"""
+    if pdfium is not None:
+        # PDFium streams the text layer without pdfplumber's layout objects
+        try:
+            pdf = pdfium.PdfDocument(_rewind(source))
+            try:
+                text = "\n".join(page.get_textpage().get_text_range() for page in pdf)
+            finally:
+                pdf.close()
+            return text.replace('\r\n', '\n')
+        except Exception:
+            pass  # Fall back to pdfplumber
+
+    parts = []
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        import pdfplumber  # Imported on first use to keep app start-up fast
+        with pdfplumber.open(_rewind(source)) as pdf:
+            page_count = len(pdf.pages)
+            if page_count < PARALLEL_PAGE_THRESHOLD:
+                page_texts = [page.extract_text() for page in pdf.pages]
+        if page_count >= PARALLEL_PAGE_THRESHOLD:
+            # pdfplumber objects can't be pickled, so each worker reopens the file
+            worker_source = source if isinstance(source, str) else _rewind(source).read()
+            with ProcessPoolExecutor() as executor:
+                page_texts = list(executor.map(extract_pdf_page, [(worker_source, i) for i in range(page_count)]))
+        for page_text in page_texts:
+            if page_text:
+                parts.append(page_text)
     except Exception as e:
         st.error(f"Error reading PDF: {e}")
-    return text
+    return "\n".join(parts)
 
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX files"""
-    text = ""
+def extract_text_from_docx(source: Union[str, IO[bytes]]) -> str:
+    """Extract text from DOCX files (path or binary file-like object)"""
     try:
-        doc = docx.Document(file_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        import docx  # Imported on first use to keep app start-up fast
+        return "\n".join(paragraph.text for paragraph in docx.Document(_rewind(source)).paragraphs)
     except Exception as e:
         st.error(f"Error reading DOCX: {e}")
-    return text
+        return ""
 
-def extract_text_from_txt(file_path: str) -> str:
-    """Extract text from TXT files"""
+def extract_text_from_txt(source: Union[str, IO[bytes]]) -> str:
+    """Extract text from TXT files (path or binary file-like object)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
+        if hasattr(source, 'read'):
+            return _rewind(source).read().decode('utf-8')
+        with open(source, 'r', encoding='utf-8') as file:
             return file.read()
     except Exception as e:
         st.error(f"Error reading TXT file: {e}")
@@ -92,90 +226,73 @@ def extract_text_from_txt(file_path: str) -> str:
 
 def extract_email(text: str) -> List[str]:
     """Extract email addresses from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(email_pattern, text)
+    return _EMAIL_RE.findall(text)
 
 def extract_phone(text: str) -> List[str]:
     """Extract phone numbers from text"""
-    phone_patterns = [
-        r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]',
-        r'\(\d{3}\)\s*\d{3}[-\.]?\d{4}',
-        r'\d{3}[-\.]?\d{3}[-\.]?\d{4}'
-    ]
-    phones = []
-    for pattern in phone_patterns:
-        phones.extend(re.findall(pattern, text))
-    return phones
+    return [phone for phone in _PHONE_RE.findall(text) if 7 <= sum(c.isdigit() for c in phone) <= 15]
 
 def extract_name(text: str) -> str:
     """Extract candidate name (basic heuristic)"""
-    lines = text.split('\n')
+    lines = text.split('\n', 5)  # Only the first 5 lines are needed
     for line in lines[:5]:  # Check first 5 lines
         line = line.strip()
-        if line and not any(word in line.lower() for word in ['resume', 'cv', 'curriculum', 'vitae', 'phone', 'email', 'linkedin']):
+        if not line:
+            continue
+        if _NAME_BLACKLIST.isdisjoint(_WORD_RE.findall(line.lower())):
             # Simple name validation (2-3 words, title case)
             words = line.split()
             if 2 <= len(words) <= 4 and all(word.istitle() for word in words if len(word) > 1):
                 return line
     return ""
 
-def extract_skills(text: str) -> List[str]:
-    """Extract skills using keyword matching"""
-    common_skills = [
-        'python', 'java', 'javascript', 'html', 'css', 'react', 'angular', 'vue',
-        'node.js', 'express', 'django', 'flask', 'fastapi', 'sql', 'nosql',
-        'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker',
-        'kubernetes', 'jenkins', 'git', 'github', 'gitlab', 'ci/cd',
-        'machine learning', 'ai', 'data analysis', 'pandas', 'numpy',
-        'tensorflow', 'pytorch', 'scikit-learn', 'tableau', 'power bi',
-        'excel', 'word', 'powerpoint', 'project management', 'agile',
-        'scrum', 'jira', 'confluence', 'rest api', 'graphql', 'microservices'
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    
-    for skill in common_skills:
-        if skill in text_lower:
-            found_skills.append(skill.title())
-    
-    return list(set(found_skills))  # Remove duplicates
-
-def extract_education(text: str) -> List[str]:
-    """Extract education information"""
-    education_terms = [
-        'bachelor', 'master', 'phd', 'doctorate', 'mba', 'bs', 'ms', 'ba', 'ma',
-        'university', 'college', 'institute', 'school', 'degree', 'graduated'
-    ]
-    
-    lines = text.split('\n')
-    education_lines = []
-    
-    for line in lines:
-        line_lower = line.lower()
-        if any(term in line_lower for term in education_terms):
-            education_lines.append(line.strip())
-    
-    return education_lines[:5]  # Return top 5 education lines
+def extract_skills(text_lower: str, skills: Tuple[str, ...] = COMMON_SKILLS, limit: int = 20) -> List[str]:
+    """Extract up to `limit` skills using keyword matching (expects already lowercased text)"""
+    # dicts keep first-seen order while deduplicating; every path stops once `limit` skills are found
+    found_skills = {}
+    if _SKILL_HS is not None and skills is COMMON_SKILLS:
+        data = text_lower.encode()
+        
+        def on_match(skill_id, start, end, flags, context):
+            if _is_whole_token(data, start, end):
+                found_skills[COMMON_SKILLS[skill_id]] = None
+            return len(found_skills) >= limit  # True stops the scan
+        
+        try:
+            _SKILL_HS.scan(data, match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+    elif _SKILL_AC is not None and skills is COMMON_SKILLS:
+        for end, (_, skill) in _SKILL_AC.iter(text_lower):
+            if _is_whole_token(text_lower, end - len(skill) + 1, end + 1):
+                found_skills[skill] = None
+                if len(found_skills) >= limit:
+                    break
+    else:
+        for match in _skills_regex(skills).finditer(text_lower):
+            found_skills[match.group(1).lower()] = None
+            if len(found_skills) >= limit:
+                break
+    return [skill.title() for skill in found_skills]
+
+def extract_education(text: str, terms: Tuple[str, ...] = EDUCATION_TERMS, limit: int = 5) -> List[str]:
+    """Extract up to `limit` education lines"""
+    matches = islice(_education_regex(terms).finditer(text), limit)  # Stop scanning after `limit` lines
+    return [match.group(0).strip() for match in matches]
 
 def parse_resume_manual(text: str) -> Dict[str, Any]:
     """Manual resume parsing using text analysis"""
+    text_lower = text.lower()  # Lowered once and shared by the case-insensitive extractors
     emails = extract_email(text)
     phones = extract_phone(text)
     name = extract_name(text)
-    skills = extract_skills(text)
+    skills = extract_skills(text_lower)
     education = extract_education(text)
     
     # Extract job title (heuristic: look for common title patterns)
     job_titles = []
-    title_patterns = [
-        r'\b(senior|junior|lead|principal)\s+[a-z]+\s+[a-z]+\b',
-        r'\b(software|web|frontend|backend|full.stack|data|devops|cloud)\s+[a-z]+\b',
-        r'\b(engineer|developer|architect|analyst|scientist|manager|director)\b'
-    ]
-    
-    for pattern in title_patterns:
-        matches = re.findall(pattern, text.lower())
+    for pattern in _TITLE_RES:
+        matches = pattern.findall(text_lower)
         job_titles.extend(matches)
     
     job_title = job_titles[0].title() if job_titles else ""
@@ -197,7 +314,7 @@ def parse_resume_manual(text: str) -> Dict[str, Any]:
         "other_info": []
     }
 
-def try_pyresparser(file_path: str) -> Dict[str, Any]:
+def try_pyresparser(source: Union[str, IO[bytes]]) -> Dict[str, Any]:
     """Try parsing with pyresparser if available"""
     try:
         # Ensure NLTK data is available
@@ -209,7 +326,8 @@ def try_pyresparser(file_path: str) -> Dict[str, Any]:
             return {}
             
         from pyresparser import ResumeParser
-        data = ResumeParser(file_path).get_extracted_data()
+        # pyresparser accepts a path or a BytesIO carrying a `name` with the extension
+        data = ResumeParser(_rewind(source)).get_extracted_data()
         
         return {
             "candidate_name": data.get('name', ''),
@@ -234,17 +352,17 @@ def try_pyresparser(file_path: str) -> Dict[str, Any]:
         st.warning(f"pyresparser failed: {e}")
         return {}
 
-def parse_resume(file_path: str, file_type: str) -> Dict[str, Any]:
-    """Main resume parsing function"""
-    start_time = datetime.now()
+def parse_resume(source: Union[str, IO[bytes]], file_type: str) -> Dict[str, Any]:
+    """Main resume parsing function (source is a path or binary file-like object)"""
+    start_time = time.perf_counter()
     
     # Extract text based on file type
     if file_type == "application/pdf":
-        text = extract_text_from_pdf(file_path)
+        text = extract_text_from_pdf(source)
     elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        text = extract_text_from_docx(file_path)
+        text = extract_text_from_docx(source)
     elif file_type == "text/plain":
-        text = extract_text_from_txt(file_path)
+        text = extract_text_from_txt(source)
     else:
         st.error(f"Unsupported file type: {file_type}")
         return {}
@@ -253,21 +371,19 @@ def parse_resume(file_path: str, file_type: str) -> Dict[str, Any]:
         st.error("No text could be extracted from the file. The file might be scanned or corrupted.")
         return {}
     
-    # Try multiple parsing methods
-    parsed_data = {}
+    # Method 1: Manual parsing on the text we already extracted
+    parsed_data = parse_resume_manual(text)
+    parsing_method = "manual"
     
-    # Method 1: Try pyresparser first
-    pyres_data = try_pyresparser(file_path)
-    if pyres_data and pyres_data.get('candidate_name'):
-        parsed_data = pyres_data
-        parsing_method = "pyresparser"
-    else:
-        # Method 2: Use manual parsing
-        parsed_data = parse_resume_manual(text)
-        parsing_method = "manual"
+    # Method 2: Only fall back to pyresparser (which re-reads the file) when no name was found
+    if not parsed_data.get('candidate_name'):
+        pyres_data = try_pyresparser(source)
+        if pyres_data and pyres_data.get('candidate_name'):
+            parsed_data = pyres_data
+            parsing_method = "pyresparser"
     
     # Calculate parsing time
-    parsing_time = (datetime.now() - start_time).total_seconds()
+    parsing_time = time.perf_counter() - start_time
     
     # Add parsing metadata
     parsed_data["parsing_metadata"] = {
@@ -279,6 +395,14 @@ def parse_resume(file_path: str, file_type: str) -> Dict[str, Any]:
     
     return parsed_data
 
+@st.cache_data(show_spinner=False)
+def parse_resume_cached(file_bytes: bytes, file_type: str, suffix: str) -> Dict[str, Any]:
+    """Parse uploaded resume bytes, reusing the result across reruns for identical uploads"""
+    # Parse straight from memory instead of round-tripping through a temp file
+    source = io.BytesIO(file_bytes)
+    source.name = f"resume{suffix}"
+    return parse_resume(source, file_type)
+
 def display_parsed_data(data: Dict[str, Any]):
     """Display parsed resume data in a user-friendly format"""
     if not data:
@@ -418,39 +542,30 @@ def main():
         st.markdown('<div class="info-box">📁 File Uploaded Successfully!</div>', unsafe_allow_html=True)
         st.write(file_details)
         
-        # Process file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
         try:
-            # Parse resume
+            # Parse resume (cached on the uploaded bytes, so reruns don't reparse)
             with st.spinner("🔄 Parsing resume... This may take a few seconds."):
-                parsed_data = parse_resume(tmp_path, uploaded_file.type)
+                parsed_data = parse_resume_cached(
+                    uploaded_file.getvalue(),
+                    uploaded_file.type,
+                    os.path.splitext(uploaded_file.name)[1]
+                )
             
             if parsed_data:
                 display_parsed_data(parsed_data)
                 
-                # Download option
-                if st.button("📥 Download Parsed Data as JSON"):
-                    json_str = json.dumps(parsed_data, indent=2)
-                    st.download_button(
-                        label="Download JSON",
-                        data=json_str,
-                        file_name=f"parsed_resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json"
-                    )
+                # Download option (a single download button, no extra click-and-rerun round trip)
+                st.download_button(
+                    label="📥 Download Parsed Data as JSON",
+                    data=json.dumps(parsed_data, indent=2),
+                    file_name=f"parsed_resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    mime="application/json"
+                )
             else:
                 st.error("Failed to parse the resume. Please try with a different file.")
                 
         except Exception as e:
             st.error(f"An error occurred during parsing: {str(e)}")
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
     
     else:
         # Welcome message when no file is uploaded
@@ -0,0 +1,81 @@
+import hashlib
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+# Default location of the response cache database
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "resume_parser.db"
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Apply NFKC normalization and collapse whitespace, so prompts that only differ in formatting
+    (e.g. the same resume extracted from PDF with ligatures and non-breaking spaces, and from DOCX)
+    share a cache entry.
+
+    Args:
+        prompt (str): The prompt sent to the model
+
+    Returns:
+        str: Normalized prompt
+    """
+    return " ".join(unicodedata.normalize("NFKC", prompt).split())
+
+
+class ResponseCache:
+    """
+    Exact-match cache of model responses stored in SQLite, keyed on a SHA-256
+    of the model name, request mode and normalized prompt.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, content TEXT, created_at INTEGER)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def make_key(model_name: str, mode: str, prompt: str) -> bytes:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model_name (str): Name of the model
+            mode (str): Request mode, e.g. whether JSON output was requested
+            prompt (str): The full prompt sent to the model
+
+        Returns:
+            bytes: SHA-256 digest identifying the request
+        """
+        return hashlib.sha256(f"{model_name}|{mode}|{normalize_prompt(prompt)}".encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (bytes): Key from make_key
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        row = self.connection.execute("SELECT content FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: bytes, content: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key (bytes): Key from make_key
+            content (str): Model response to cache
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cache (key, content, created_at) VALUES (?, ?, ?)",
+            (key, content, int(time.time()))
+        )
+        self.connection.commit()
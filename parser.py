@@ -1,29 +1,48 @@
 import argparse
-import json
+import asyncio
+import hashlib
+import io
 import logging
 import os
+import re
 import sys
 import time
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import List
 
-import docx
-import openai
-from PyPDF2 import PdfReader
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from pydantic import TypeAdapter
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
-import threading
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 from pydantic_models_prompts import (
     BasicInfo, WorkExperience, Education, Skills,
     create_basic_details_prompt, create_skills_prompt,
-    create_work_experience_prompt, create_education_prompt,
+    create_work_experience_prompt, create_education_prompt, create_combined_prompt,
+    create_resume_block,
     fallback_basic_info_prompt, fallback_skills_prompt,
-    fallback_education_prompt, companies_prompt
+    fallback_education_prompt, companies_prompt, STRUCTS
 )
-from utils import extract_emails, extract_github_and_linkedin_urls
-from utils import output_template
+from cache import ResponseCache
+from utils import extract_emails, extract_github_and_linkedin_urls, extract_section_snippet
+from utils import make_output_template
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -34,39 +53,54 @@ logger.addHandler(stream_handler)
 
 load_dotenv()
 
+# Maximum number of per-company work experience requests in flight at once
+MAX_CONCURRENT_COMPANY_REQUESTS = 8
 
-class ResumeManager:
-    def __init__(self, resume_f, model_name, extension=None):
-        self.output = deepcopy(output_template)
-        self.resume = get_resume_content(resume_f, extension)
-        self.model_name = model_name
-        self.client = OpenAI()
-        self.companies = []
+# Validation is off unless ENABLE_VALIDATION is set; --validate / validate= override it
+ENABLE_VALIDATION = os.getenv("ENABLE_VALIDATION", "").lower() in ("1", "true", "yes")
 
-    def process_file(self):
-        all_threads = []
-        for target in [
-            self.extract_work_experience,
-            self.extract_basic_info,
-            self.extract_education,
-            self.extract_skills
-        ]:
-            thread = threading.Thread(target=target)
-            all_threads.append(thread)
-            thread.start()
-
-        for thread in all_threads:
-            thread.join()
-
-    def extract_pydantic(self, target_schema):
-        """Extract structured data using OpenAI with JSON mode"""
-        start = time.time()
-        
-        # Get schema fields
-        schema_fields = list(target_schema.__fields__.keys())
-        
-        # Create a schema description for the AI
-        schema_description = f"""
+# Supported resume file extensions
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+
+def is_transient_error(error):
+    """
+    Errors worth retrying: rate limits, timeouts, dropped connections and 5xx responses
+    """
+    import openai
+
+    return isinstance(error, (
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.InternalServerError,
+    ))
+
+
+retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=8),
+    retry=retry_if_exception(is_transient_error),
+    reraise=True,
+)
+
+# Upper bound on resume tokens sent with each prompt
+MAX_RESUME_TOKENS = 6000
+
+_BULLET_RE = re.compile(r"[\u2022\u2023\u25aa\u25ab\u25cf\u25e6\u25a0\u25ba\u2043\uf0b7]+")
+_SPACES_RE = re.compile(r"[ \t\xa0]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def build_schema_instructions(target_schema):
+    """
+    Build the extract_pydantic instructions asking for a JSON array of target_schema entries
+    """
+    # Get schema fields
+    schema_fields = list(target_schema.model_fields)
+    
+    # Create a schema description for the AI
+    schema_description = f"""
         Extract information from the resume and return as a JSON array of objects.
         Each object should have these fields: {', '.join(schema_fields)}
         
@@ -82,52 +116,105 @@ class ResumeManager:
             ]
         }}
         """
-        
-        prompt = f"""
+    
+    return f"""
         {schema_description}
         
-        Resume Content:
-        {self.resume}
-        
-        Extract all relevant entries and return only valid JSON.
+        You are a resume parser. Extract all relevant entries and return only valid JSON.
         """
+
+
+# Schema fields never change, so the instructions for each schema are built once at import
+_SCHEMA_INSTRUCTIONS = {schema: build_schema_instructions(schema) for schema in (Education, WorkExperience)}
+
+
+class ResumeManager:
+    def __init__(self, resume_f, model_name, extension=None, use_cache=True, validate=None, stream=False):
+        from openai import AsyncOpenAI
+
+        self.output = make_output_template()
+        self.model_name = model_name
+        self.resume = truncate_resume(normalize_resume_text(get_resume_content(resume_f, extension)), model_name)
+        # Sent as the request `user` so calls for one resume are routed to the same prompt cache
+        self.resume_hash = hashlib.sha256(self.resume.encode("utf-8")).hexdigest()
+        # One async client, so every request shares its connection pool.
+        # Retries are handled by retry_transient, so the SDK's own retries are disabled.
+        self.client = AsyncOpenAI(max_retries=0)
+        self.cache = ResponseCache() if use_cache else None
+        # JSON mode already guarantees well-formed output, so trusted model output skips
+        # pydantic entirely unless validation is requested or ENABLE_VALIDATION is set
+        self.validate = ENABLE_VALIDATION if validate is None else validate
+        # Streamed responses keep the 15s timeout between chunks instead of for the whole reply
+        self.stream = stream
+        self.companies = []
+
+    def process_file(self):
+        asyncio.run(self._process_file())
+
+    async def _process_file(self):
+        # Extractors return their own sections, merged here in one place once all have finished
+        results = await asyncio.gather(
+            self.extract_work_experience(),
+            self.extract_basic_info(),
+            self.extract_education(),
+            self.extract_skills()
+        )
+        for result in results:
+            merge_output(self.output, result)
+
+    def process_file_batched(self):
+        """Extract every section with one model call instead of four"""
+        asyncio.run(self._process_file_batched())
+
+    async def _process_file_batched(self):
+        query = create_combined_prompt(self.resume)
+        output, seconds = await self.query_model(query)
+        logger.info("# Combined Extraction took %s seconds", seconds)
+
+        try:
+            combined = orjson.loads(output)
+        except orjson.JSONDecodeError:
+            combined = {}
+
+        if not is_combined_output(combined):
+            logger.warning("Combined extraction failed, falling back to per-section extraction")
+            await self._process_file()
+            return
+
+        apply_combined_output(self.output, combined, self.resume, self.validate)
+
+    async def extract_pydantic(self, target_schema):
+        """Extract structured data using OpenAI with JSON mode"""
+        start = time.time()
+        
+        instructions = _SCHEMA_INSTRUCTIONS.get(target_schema) or build_schema_instructions(target_schema)
+
+        # Resume first so this prompt shares its cached prefix with the other extractors
+        prompt = create_resume_block(self.resume) + instructions
         
         try:
-            completion = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a resume parser. Extract structured data and return only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                timeout=15,
-            )
+            cache_key = ResponseCache.make_key(self.model_name, "pydantic", prompt)
+            result = self.cache.get(cache_key) if self.cache else None
+            if result is None:
+                result, finish_reason = await self.request_completion(prompt)
+            else:
+                finish_reason = None
             
-            result = completion.choices[0].message.content
-            parsed_result = json.loads(result)
+            parsed_result = orjson.loads(result)
+            # Only complete replies that parsed are cached, so a truncated reply is retried next run
+            if self.cache and finish_reason == "stop":
+                self.cache.set(cache_key, result)
             
-            # Convert to list of target schema objects
-            extracted_data = []
+            # Convert to list of dicts with the target schema fields
+            items = []
             if 'data' in parsed_result and isinstance(parsed_result['data'], list):
-                for item in parsed_result['data']:
-                    try:
-                        # Create instance of the target schema
-                        obj = target_schema(**item)
-                        extracted_data.append(obj)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse item: {item}, error: {e}")
-                        continue
+                items = parsed_result['data']
             else:
                 # Try to find any array in the result
                 for key, value in parsed_result.items():
                     if isinstance(value, list):
-                        for item in value:
-                            try:
-                                obj = target_schema(**item)
-                                extracted_data.append(obj)
-                            except Exception as e:
-                                logger.warning(f"Failed to parse item: {item}, error: {e}")
-                                continue
+                        items.extend(value)
+            extracted_data = coerce_items(target_schema, items, self.validate)
             
             end = time.time()
             seconds = end - start
@@ -136,146 +223,218 @@ class ResumeManager:
         except Exception as e:
             end = time.time()
             seconds = end - start
-            logger.error(f"Extraction error: {e}")
+            logger.error("Extraction error: %s", e)
             return [], seconds
 
-    def query_model(self, query, json_mode=True):
+    @retry_transient
+    async def create_completion(self, **kwargs):
+        """Create a chat completion, retrying transient errors with exponential backoff"""
+        return await self.client.chat.completions.create(**kwargs)
+
+    async def request_completion(self, prompt, json_mode=True):
+        """Send one prompt, streaming the reply if requested, and return its content and finish reason"""
+        request = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "user": self.resume_hash,
+            "timeout": 15,
+        }
+        if json_mode:
+            request["response_format"] = {'type': 'json_object'}
+
+        if self.stream:
+            completion = await self.create_completion(
+                stream=True, stream_options={"include_usage": True}, **request
+            )
+            return await self.collect_stream(completion)
+
+        completion = await self.create_completion(**request)
+        self.log_prompt_cache(completion)
+        return completion.choices[0].message.content, completion.choices[0].finish_reason
+
+    async def collect_stream(self, stream):
+        """Join the content deltas of a streamed completion as they arrive, returning it with its finish reason"""
+        parts = []
+        finish_reason = None
+        async for chunk in stream:
+            if chunk.choices:
+                parts.append(chunk.choices[0].delta.content or "")
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+            if chunk.usage:
+                # With include_usage the final chunk carries the usage and no choices
+                self.log_prompt_cache(chunk)
+        return "".join(parts), finish_reason
+
+    @staticmethod
+    def is_cacheable(result, finish_reason, json_mode):
+        """Only cache complete replies, and in JSON mode only replies that parse"""
+        if not result or finish_reason != "stop":
+            return False
+        if json_mode:
+            try:
+                orjson.loads(result)
+            except orjson.JSONDecodeError:
+                return False
+        return True
+
+    @staticmethod
+    def log_prompt_cache(completion):
+        """Log how much of the prompt was served from the provider's prompt cache"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        usage = completion.usage
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        if details is not None:
+            logger.debug("# Prompt cache: %s of %s prompt tokens cached", details.cached_tokens, usage.prompt_tokens)
+
+    async def query_model(self, query, json_mode=True):
         start = time.time()
 
+        cache_key = ResponseCache.make_key(self.model_name, f"json={json_mode}", query)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, time.time() - start
+
         try:
-            if json_mode:
-                completion = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": query}],
-                    response_format={'type': 'json_object'},
-                    timeout=15,
-                )
-            else:
-                completion = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": query}],
-                    timeout=15,
-                )
+            result, finish_reason = await self.request_completion(query, json_mode)
 
             end = time.time()
             seconds = end - start
-            result = completion.choices[0].message.content
+            if self.cache and self.is_cacheable(result, finish_reason, json_mode):
+                self.cache.set(cache_key, result)
             return result, seconds
             
         except Exception as e:
             end = time.time()
             seconds = end - start
-            logger.error(f"Query error: {e}")
+            logger.error("Query error: %s", e)
             return "{}" if json_mode else "", seconds
 
-    def extract_basic_info(self):
+    async def extract_basic_info(self):
+        result = {'contact_info': {}}
         try:
             query = create_basic_details_prompt(self.resume)
-            output, seconds = self.query_model(query)
+            output, seconds = await self.query_model(query)
             
-            output_json = json.loads(output)
-            logger.debug(f"# Basic Info Extract:\n{output_json}")
-            logger.info(f"# Basic Info Extraction took {seconds} seconds")
+            output_json = orjson.loads(output)
+            logger.debug("# Basic Info Extract:\n%s", output_json)
+            logger.info("# Basic Info Extraction took %s seconds", seconds)
 
             # Extract basic info
-            self.output['candidate_name'] = output_json.get('name', '')
-            self.output['job_title'] = output_json.get('job_title', '')
-            self.output['bio'] = output_json.get('bio', '')
+            result['candidate_name'] = output_json.get('name', '')
+            result['job_title'] = output_json.get('job_title', '')
+            result['bio'] = output_json.get('bio', '')
             
             # Contact info
             if 'location' in output_json:
-                self.output['contact_info']['location'] = output_json['location']
+                result['contact_info']['location'] = output_json['location']
             if 'phone' in output_json:
-                self.output['contact_info']['phone_number'] = output_json['phone']
+                result['contact_info']['phone_number'] = output_json['phone']
                 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.warning("Basic info extraction returned invalid JSON, using fallback")
-            self.fallback_basic_info()
+            result.update(await self.fallback_basic_info())
         except Exception as e:
-            logger.error(f"Basic info extraction error: {e}")
-            self.fallback_basic_info()
+            logger.error("Basic info extraction error: %s", e)
+            result.update(await self.fallback_basic_info())
 
         # Always extract emails and URLs directly from text
-        self.output['contact_info']['email_address'] = extract_emails(self.resume)
-        self.output['contact_info']['personal_urls'] = extract_github_and_linkedin_urls(self.resume)
+        result['contact_info']['email_address'] = extract_emails(self.resume)
+        result['contact_info']['personal_urls'] = extract_github_and_linkedin_urls(self.resume)
+        return result
 
-    def fallback_basic_info(self):
+    async def fallback_basic_info(self):
         """Fallback method for basic info extraction"""
+        result = {}
         try:
             # Extract name
             name_query = fallback_basic_info_prompt.format(query='name', resume=self.resume)
-            name, _ = self.query_model(name_query, json_mode=False)
-            self.output['candidate_name'] = name.strip() if name else ""
+            name, _ = await self.query_model(name_query, json_mode=False)
+            result['candidate_name'] = name.strip() if name else ""
             
             # Extract job title
             title_query = fallback_basic_info_prompt.format(query='current or last job title', resume=self.resume)
-            title, _ = self.query_model(title_query, json_mode=False)
-            self.output['job_title'] = title.strip() if title else ""
+            title, _ = await self.query_model(title_query, json_mode=False)
+            result['job_title'] = title.strip() if title else ""
             
         except Exception as e:
-            logger.error(f"Fallback basic info error: {e}")
+            logger.error("Fallback basic info error: %s", e)
+        return result
 
-    def extract_skills(self):
+    async def extract_skills(self):
         try:
             query = create_skills_prompt(self.resume)
-            output, seconds = self.query_model(query)
-            output_json = json.loads(output)
+            output, seconds = await self.query_model(query)
+            output_json = orjson.loads(output)
             
-            logger.debug(f"# Skills Extract:\n{output_json}")
-            logger.info(f"# Skills Extraction took {seconds} seconds")
+            logger.debug("# Skills Extract:\n%s", output_json)
+            logger.info("# Skills Extraction took %s seconds", seconds)
             
-            self.output['skills'] = output_json.get('skills', [])
-            self.output['professional_development'] = output_json.get('professional_development', [])
-            self.output['other_info'] = output_json.get('other', [])
+            return {
+                'skills': output_json.get('skills', []),
+                'professional_development': output_json.get('professional_development', []),
+                'other_info': output_json.get('other', []),
+            }
             
-        except (json.JSONDecodeError, KeyError, Exception) as e:
-            logger.warning(f"Skills extraction failed: {e}, using fallback")
+        except (orjson.JSONDecodeError, KeyError, Exception) as e:
+            logger.warning("Skills extraction failed: %s, using fallback", e)
             query = fallback_skills_prompt.format(resume=self.resume)
-            output, seconds = self.query_model(query, json_mode=False)
-            logger.debug(f"# Skills Extract Fallback:\n{output}")
-            logger.info(f"# Skills Extraction took {seconds} seconds")
+            output, seconds = await self.query_model(query, json_mode=False)
+            logger.debug("# Skills Extract Fallback:\n%s", output)
+            logger.info("# Skills Extraction took %s seconds", seconds)
             
             # Parse comma-separated skills
             if output:
                 skills = [skill.strip() for skill in output.split(',') if skill.strip()]
-                self.output['skills'] = skills
+                return {'skills': skills}
+            return {}
 
-    def extract_education(self):
+    async def extract_education(self):
         try:
-            output, seconds = self.extract_pydantic(Education)
-            logger.debug(f"# Education Extract:\n{output}")
-            logger.info(f"# Education Extraction took {seconds} seconds")
+            output, seconds = await self.extract_pydantic(Education)
+            logger.debug("# Education Extract:\n%s", output)
+            logger.info("# Education Extraction took %s seconds", seconds)
             
             # Convert to JSON-serializable format
-            self.output['education'] = [json.loads(x.json()) for x in output]
+            return {'education': output}
 
         except Exception as e:
-            logger.warning(f"Education extraction failed: {e}, using fallback")
-            query = fallback_education_prompt.format(resume=self.resume)
-            output, seconds = self.query_model(query, json_mode=False)
-            logger.debug(f"# Education Extract Fallback:\n{output}")
-            logger.info(f"# Education Extraction took {seconds} seconds")
+            logger.warning("Education extraction failed: %s, using fallback", e)
+            query = fallback_education_prompt.format(resume=extract_section_snippet(self.resume, 'education'))
+            output, seconds = await self.query_model(query, json_mode=False)
+            logger.debug("# Education Extract Fallback:\n%s", output)
+            logger.info("# Education Extraction took %s seconds", seconds)
             
             # Store the raw text output
-            self.output['education'] = output if output else ""
+            return {'education': output if output else ""}
 
-    def extract_work_experience(self):
+    async def extract_work_experience(self):
         try:
-            output, seconds = self.extract_pydantic(WorkExperience)
-            logger.debug(f"# Work Experience Extract:\n{output}")
-            logger.info(f"# Work Experience Extraction took {seconds} seconds")
+            output, seconds = await self.extract_pydantic(WorkExperience)
+            logger.debug("# Work Experience Extract:\n%s", output)
+            logger.info("# Work Experience Extraction took %s seconds", seconds)
             
-            self.output['work_output'] = [json.loads(x.json()) for x in output]
+            return {'work_output': output}
             
         except Exception as e:
-            logger.warning(f"Work extraction failed: {e}, using fallback")
-            self.fallback_extract_work_experience()
+            logger.warning("Work extraction failed: %s, using fallback", e)
+            return await self.fallback_extract_work_experience()
 
-    def fallback_extract_work_experience(self):
-        query = companies_prompt.format(resume=self.resume)
-        output, _ = self.query_model(query, json_mode=False)
+    async def fallback_extract_work_experience(self):
+        # Only the work section is sent, the per-company prompts below repeat it many times
+        work_section = extract_section_snippet(self.resume, 'work')
+        query = companies_prompt.format(resume=work_section)
+        output, _ = await self.query_model(query, json_mode=False)
 
-        all_threads = []
+        # Cap concurrent per-company requests so long resumes don't trip rate limits
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMPANY_REQUESTS)
+
+        async def bounded_work_experience(company_name, role):
+            async with semaphore:
+                return await self.get_intermediary_work_experience(company_name, role, work_section)
+
+        tasks = []
 
         for line in output.split('\n'):
             if "answer" in line.lower() or not line.strip():
@@ -289,27 +448,291 @@ class ResumeManager:
                     
                 role = entry[1].strip() if len(entry) > 1 else ""
                 
-                thread = threading.Thread(target=self.get_intermediary_work_experience, args=(company_name, role))
-                all_threads.append(thread)
-                thread.start()
+                tasks.append(bounded_work_experience(company_name, role))
 
-        for thread in all_threads:
-            thread.join()
+        # gather keeps resume order, failed companies come back as None
+        work_output = await asyncio.gather(*tasks)
+        return {'work_output': [entry for entry in work_output if entry is not None]}
 
-    def get_intermediary_work_experience(self, company_name, role):
+    async def get_intermediary_work_experience(self, company_name, role, resume_text=None):
         try:
-            query = create_work_experience_prompt(company_name, role, self.resume)
-            output, seconds = self.query_model(query, json_mode=True)
+            query = create_work_experience_prompt(company_name, role, resume_text or self.resume)
+            output, seconds = await self.query_model(query, json_mode=True)
             
-            parsed_output = json.loads(output)
-            logger.debug(f"# Intermediary Work Experience Extract:\n{parsed_output}")
-            logger.info(f"# Intermediary Work Experience Extraction took {seconds} seconds")
+            parsed_output = orjson.loads(output)
+            logger.debug("# Intermediary Work Experience Extract:\n%s", parsed_output)
+            logger.info("# Intermediary Work Experience Extraction took %s seconds", seconds)
             
-            self.output['work_output'].append(parsed_output)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse work experience for {company_name}: {e}")
+            return parsed_output
+        except orjson.JSONDecodeError as e:
+            logger.warning("Failed to parse work experience for %s: %s", company_name, e)
+        except Exception as e:
+            logger.error("Error getting work experience for %s: %s", company_name, e)
+        return None
+
+
+def merge_output(output, result):
+    """
+    Merge the sections returned by one extractor into an output dict
+    """
+    for key, value in result.items():
+        if isinstance(value, dict) and isinstance(output.get(key), dict):
+            output[key].update(value)
+        else:
+            output[key] = value
+
+
+# Expected type of each section of a combined single-prompt response
+COMBINED_SECTION_TYPES = {
+    'basic_info': dict,
+    'skills': dict,
+    'education': list,
+    'work_experience': list,
+}
+
+
+def is_combined_output(combined):
+    """
+    Check that a combined single-prompt response has the expected shape: a dict with at least
+    one of the COMBINED_SECTION_TYPES sections, and every section present having its type
+    """
+    if not isinstance(combined, dict):
+        return False
+    present = [section for section in COMBINED_SECTION_TYPES if combined.get(section) is not None]
+    return bool(present) and all(
+        isinstance(combined[section], COMBINED_SECTION_TYPES[section]) for section in present
+    )
+
+
+def apply_combined_output(output, combined, resume, validate=False):
+    """
+    Dispatch a combined single-prompt response into an output dict, treating
+    sections of the wrong type as empty and coercing entries to their schemas
+    """
+    if not isinstance(combined, dict):
+        combined = {}
+    sections = {
+        section: combined.get(section) if isinstance(combined.get(section), section_type) else section_type()
+        for section, section_type in COMBINED_SECTION_TYPES.items()
+    }
+
+    basic_info = sections['basic_info']
+    output['candidate_name'] = basic_info.get('name', '')
+    output['job_title'] = basic_info.get('job_title', '')
+    output['bio'] = basic_info.get('bio', '')
+    if 'location' in basic_info:
+        output['contact_info']['location'] = basic_info['location']
+    if 'phone' in basic_info:
+        output['contact_info']['phone_number'] = basic_info['phone']
+
+    skills = sections['skills']
+    output['skills'] = skills.get('skills', [])
+    output['professional_development'] = skills.get('professional_development', [])
+    output['other_info'] = skills.get('other', [])
+
+    output['education'] = coerce_items(Education, sections['education'], validate)
+    output['work_output'] = coerce_items(WorkExperience, sections['work_experience'], validate)
+
+    # Always extract emails and URLs directly from text
+    output['contact_info']['email_address'] = extract_emails(resume)
+    output['contact_info']['personal_urls'] = extract_github_and_linkedin_urls(resume)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema):
+    """
+    TypeAdapter validating and dumping a whole list of schema entries in one call
+    """
+    return TypeAdapter(List[schema])
+
+
+def validate_entries(schema, items):
+    """
+    Validate extracted entries against a schema and return them as plain dicts, using the
+    schema's msgspec mirror when msgspec is installed. Raises ValueError on invalid entries.
+    """
+    struct = STRUCTS.get(schema)
+    if struct is not None:
+        return msgspec.to_builtins(msgspec.convert(items, List[struct]))
+    adapter = list_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(items), mode="json")
+
+
+def coerce_items(target_schema, items, validate=False):
+    """
+    Keep only the schema fields of extracted items, validating them if requested
+    """
+    if validate:
+        try:
+            return validate_entries(target_schema, items)
+        except ValueError:
+            # Validate item by item so one bad entry doesn't drop the others
+            pass
+
+    extracted_data = []
+    for item in items:
+        try:
+            extracted_data.append(coerce_item(target_schema, item, validate))
         except Exception as e:
-            logger.error(f"Error getting work experience for {company_name}: {e}")
+            logger.warning("Failed to parse item: %s, error: %s", item, e)
+    return extracted_data
+
+
+def coerce_item(target_schema, item, validate=False):
+    """
+    Keep only the schema fields of an extracted item, validating it if requested
+    """
+    if validate:
+        return validate_entries(target_schema, [item])[0]
+    return {field: item.get(field) for field in target_schema.model_fields}
+
+
+def normalize_resume_text(text):
+    """
+    Replace bullet glyphs and runs of spaces with single spaces and drop blank lines,
+    which cuts prompt tokens without changing the resume content
+    """
+    text = _BULLET_RE.sub(" ", text)
+    text = _SPACES_RE.sub(" ", text)
+    return _BLANK_LINES_RE.sub("\n", text).strip()
+
+
+def truncate_resume(text, model_name, max_tokens=MAX_RESUME_TOKENS):
+    """
+    Cap resume text at max_tokens tokens of the model's tokenizer (needs tiktoken)
+    """
+    if tiktoken is None:
+        return text
+    try:
+        encoding = tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    logger.warning("Resume has %s tokens, truncating to %s", len(tokens), max_tokens)
+    return encoding.decode(tokens[:max_tokens])
+
+
+def call_with_backoff(func, *args, **kwargs):
+    """
+    Call an OpenAI client method, retrying transient errors with exponential backoff
+    """
+    return retry_transient(func)(*args, **kwargs)
+
+
+def batch_process_files(file_paths, model_name, poll_interval=30, validate=None):
+    """
+    Parse many resumes through the OpenAI Batch API, one combined request per resume.
+    Blocks until the batch finishes and returns a dict of file path -> output.
+    """
+    from openai import OpenAI
+
+    validate = ENABLE_VALIDATION if validate is None else validate
+
+    client = OpenAI(max_retries=0)  # Retries are handled by call_with_backoff
+    resumes = {
+        str(i): (path, truncate_resume(normalize_resume_text(get_resume_content(path)), model_name))
+        for i, path in enumerate(file_paths)
+    }
+
+    requests = [
+        orjson.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model_name,
+                "messages": [{"role": "user", "content": create_combined_prompt(resume)}],
+                "response_format": {"type": "json_object"},
+            },
+        })
+        for custom_id, (_, resume) in resumes.items()
+    ]
+
+    batch_file = call_with_backoff(
+        client.files.create,
+        file=("resumes.jsonl", b"\n".join(requests)),
+        purpose="batch",
+    )
+    batch = call_with_backoff(
+        client.batches.create,
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info("Submitted batch %s with %s resumes", batch.id, len(requests))
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = call_with_backoff(client.batches.retrieve, batch.id)
+
+    if batch.status != "completed" or not (batch.output_file_id or batch.error_file_id):
+        raise RuntimeError(f"Batch {batch.id} finished with status {batch.status}")
+
+    # Requests that failed outright are written to the error file, not the output file
+    if batch.error_file_id:
+        errors = call_with_backoff(client.files.content, batch.error_file_id).text
+        for line in errors.splitlines():
+            record = orjson.loads(line)
+            path, _ = resumes[record["custom_id"]]
+            error = (record.get("response") or {}).get("body") or record.get("error")
+            logger.error("Batch request failed for %s: %s", path, error)
+
+    results = {}
+    content = call_with_backoff(client.files.content, batch.output_file_id).text if batch.output_file_id else ""
+    for line in content.splitlines():
+        record = orjson.loads(line)
+        path, resume = resumes[record["custom_id"]]
+        output = make_output_template()
+        response = record.get("response") or {}
+
+        combined = {}
+        if response.get("status_code") == 200:
+            try:
+                combined = orjson.loads(response["body"]["choices"][0]["message"]["content"])
+            except (KeyError, IndexError, TypeError, orjson.JSONDecodeError) as e:
+                logger.error("Invalid batch response for %s: %s", path, e)
+            else:
+                if not is_combined_output(combined):
+                    logger.error("Unexpected batch response shape for %s, keeping only contact info", path)
+                    combined = {}
+        else:
+            logger.error("Batch request failed for %s: %s", path, record.get('error'))
+
+        apply_combined_output(output, combined, resume, validate)
+        results[path] = output
+
+    # Resumes without a usable response still get an output with the contact info found in the text
+    for path, resume in resumes.values():
+        if path not in results:
+            output = make_output_template()
+            apply_combined_output(output, {}, resume, validate)
+            results[path] = output
+
+    return results
+
+
+# Minimum page count before PDF pages are extracted in worker processes
+PARALLEL_PAGE_THRESHOLD = 4
+
+
+def _extract_page_text(file_path, page_idx):
+    """
+    Extract the text of a single PDF page (runs in a worker process)
+    """
+    from PyPDF2 import PdfReader
+
+    return PdfReader(file_path).pages[page_idx].extract_text()
+
+
+def read_file_stream(file_path):
+    """
+    Read a file in one call and serve it from memory, so PDF xref lookups and
+    DOCX zip reads seek within a buffer instead of issuing read()/lseek() syscalls
+    """
+    return io.BytesIO(Path(file_path).read_bytes())
 
 
 def get_resume_content(file_path, extension=None):
@@ -319,29 +742,42 @@ def get_resume_content(file_path, extension=None):
     if not extension:
         extension = os.path.splitext(file_path)[1]
         
-    content = ""
-    
     try:
-        if extension.lower() == '.pdf':
-            pdf_reader = PdfReader(file_path)
-            for page in pdf_reader.pages:
-                text = page.extract_text()
-                if text:
-                    content += text + "\n"
+        if extension.lower() == '.pdf' and pdfium is not None:
+            # PDFium (C++) text extraction, much faster than PyPDF2's pure-Python parser
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                page_texts = (page.get_textpage().get_text_range() for page in pdf)
+                parts = [text.replace('\r\n', '\n') for text in page_texts if text]
+            finally:
+                pdf.close()
+
+        elif extension.lower() == '.pdf':
+            from PyPDF2 import PdfReader
+
+            pdf_reader = PdfReader(read_file_stream(file_path))
+            page_count = len(pdf_reader.pages)
+            if page_count >= PARALLEL_PAGE_THRESHOLD:
+                # PyPDF2 extraction is pure Python, so spread pages over processes to escape the GIL
+                with ProcessPoolExecutor() as executor:
+                    page_texts = executor.map(partial(_extract_page_text, file_path), range(page_count))
+                    parts = [text for text in page_texts if text]
+            else:
+                parts = [text for page in pdf_reader.pages if (text := page.extract_text())]
                     
         elif extension.lower() in ['.docx', '.doc']:
-            doc = docx.Document(file_path)
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    content += paragraph.text + "\n"
+            import docx
+
+            doc = docx.Document(read_file_stream(file_path))
+            parts = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
         else:
             raise ValueError(f"Unsupported file type: {extension}")
             
     except Exception as e:
-        logger.error(f"Error reading file {file_path}: {e}")
+        logger.error("Error reading file %s: %s", file_path, e)
         raise
     
-    return content.strip()
+    return "\n".join(parts).strip()
 
 
 if __name__ == "__main__":
@@ -349,19 +785,36 @@ if __name__ == "__main__":
     parser.add_argument("file_path", help="Path to the resume, accepted types .pdf or .docx")
     parser.add_argument("--model_name", default='gpt-3.5-turbo-1106',
                         help="Name of the model, default to gpt-3.5-turbo-1106")
+    parser.add_argument("--single_prompt", action="store_true",
+                        help="Extract all sections with one model call instead of four")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Always call the model instead of reusing cached responses")
+    parser.add_argument("--validate", action="store_true", default=None,
+                        help="Validate extracted education and work entries against the pydantic schemas")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream model responses, useful for long work experience lists")
 
     args = parser.parse_args()
     
     if not os.path.exists(args.file_path):
-        logger.error(f"File not found: {args.file_path}")
+        logger.error("File not found: %s", args.file_path)
+        sys.exit(1)
+
+    extension = os.path.splitext(args.file_path)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        logger.error("Unsupported file type: %s, accepted types are %s", extension, ', '.join(SUPPORTED_EXTENSIONS))
         sys.exit(1)
         
-    logging.info(f"Processing {args.file_path}")
+    logging.info("Processing %s", args.file_path)
 
-    resume_manager = ResumeManager(args.file_path, args.model_name)
+    resume_manager = ResumeManager(args.file_path, args.model_name,
+                                   use_cache=not args.no_cache, validate=args.validate, stream=args.stream)
 
     start_time = time.time()
-    resume_manager.process_file()
+    if args.single_prompt:
+        resume_manager.process_file_batched()
+    else:
+        resume_manager.process_file()
     end_time = time.time()
 
     resume_name = Path(args.file_path).stem
@@ -370,11 +823,12 @@ if __name__ == "__main__":
     # Create directory if it doesn't exist
     os.makedirs("parsed_outputs", exist_ok=True)
     
-    with open(output_file_path, 'w', encoding='utf-8') as file:
-        json.dump(resume_manager.output, file, indent=2, ensure_ascii=False)
+    output_bytes = orjson.dumps(resume_manager.output, option=orjson.OPT_INDENT_2)
+    with open(output_file_path, 'wb') as file:
+        file.write(output_bytes)
 
-    print(json.dumps(resume_manager.output, indent=2))
+    print(output_bytes.decode('utf-8'))
 
     seconds = end_time - start_time
     m, s = divmod(seconds, 60)
-    logger.info(f"Total time {int(m)} min {int(s)} seconds")
\ No newline at end of file
+    logger.info("Total time %s min %s seconds", int(m), int(s))
\ No newline at end of file
@@ -0,0 +1,23 @@
+import io
+from typing import Tuple, Union
+
+
+def extract_pdf_page(args: Tuple[Union[str, bytes], int]) -> str:
+    """
+    Extract the text of one PDF page with pdfplumber. Used as a process pool worker, so it
+    lives in an importable module rather than the Streamlit script, which runs as a synthetic
+    __main__ that worker processes can't import under spawn or forkserver.
+
+    Args:
+        args (Tuple[Union[str, bytes], int]): PDF path or bytes, and the page index
+
+    Returns:
+        str: The page text, or None when the page has no text layer
+    """
+    import pdfplumber
+
+    source, page_index = args
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with pdfplumber.open(source) as pdf:
+        return pdf.pages[page_index].extract_text()
@@ -1,7 +1,32 @@
+from functools import lru_cache
 from typing import List, Optional
 from pydantic import BaseModel, Field
 import json
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Every prompt starts with this identical resume block and puts the task-specific
+# instructions after it, so repeated calls for one resume share the longest
+# possible prefix and hit the provider's prompt cache.
+RESUME_BLOCK = """Resume Content:
+{resume}
+
+---
+Task:
+"""
+
+
+def create_resume_block(resume_text):
+    return RESUME_BLOCK.format(resume=resume_text)
+
+
+def escape_braces(text):
+    """Escape literal braces so text can be embedded in a str.format template"""
+    return text.replace("{", "{{").replace("}", "}}")
+
 # --------------------------------------------------------------------------------------------------------------- #
 # Basic Info model and prompts
 class BasicInfo(BaseModel):
@@ -12,6 +37,7 @@ class BasicInfo(BaseModel):
     phone: Optional[str] = Field(description="phone number of the candidate")
 
 
+@lru_cache(maxsize=None)
 def get_basic_info_format_instructions():
     return """Return a JSON object with the following structure:
 {
@@ -23,19 +49,12 @@ def get_basic_info_format_instructions():
 }"""
 
 
-basic_details_prompt = f"""
-Extract the basic information from the resume and return as JSON with the following structure:
-{get_basic_info_format_instructions()}
-
-Resume:
-{{resume}}
+basic_details_prompt = RESUME_BLOCK + f"""Extract the basic information from the resume and return as JSON with the following structure:
+{escape_braces(get_basic_info_format_instructions())}
 """
 
 
-fallback_basic_info_prompt = """
-What is the {query}?
-RESUME:
-{resume}
+fallback_basic_info_prompt = RESUME_BLOCK + """What is the {query}?
 ANSWER:
 """
 
@@ -51,15 +70,11 @@ class WorkExperience(BaseModel):
     description: Optional[str] = Field(description="description, if not present use 'None' ")
 
 
-class SingleWorkExperience(BaseModel):
-    """Work experiences"""
-    company_name: str = Field(description="name of the company")
-    job_title: str = Field(description="job title")
-    start_date: str = Field(description="start date, if not present use 'None'")
-    end_date: str = Field(description="end date, if not present use 'None'")
-    description: Optional[str] = Field(description="description, if not present use 'None' ")
+# Same fields as WorkExperience, aliased so pydantic only builds one schema and validator
+SingleWorkExperience = WorkExperience
 
 
+@lru_cache(maxsize=None)
 def get_work_experience_format_instructions():
     return """Return a JSON object with the following structure:
 {
@@ -71,27 +86,19 @@ def get_work_experience_format_instructions():
 }"""
 
 
-work_experience_template = f"""
-What was this person work experience at {{company}} as a {{role}}?
-
-RESUME:
-{{resume}}
+work_experience_template = RESUME_BLOCK + f"""Extract work experience information for {{company}} as {{role}}.
 
-{get_work_experience_format_instructions()}
+{escape_braces(get_work_experience_format_instructions())}
 """
 
 
-companies_prompt = """
-What companies did this candidate work at and what was their job title? Only use the resume to answer, do not make up answers. Use the template to format the answer:
+companies_prompt = RESUME_BLOCK + """What companies did this candidate work at and what was their job title? Only use the resume to answer, do not make up answers. Use the template to format the answer:
 
 TEMPLATE:
 company 1, job title 1
 company 2, job title 2
 company 3, job title 3
 
-RESUME:
-{resume}
-
 ANSWER:
 """
 
@@ -106,6 +113,7 @@ class Skills(BaseModel):
         description="language skills, interests, hobbies, extra-curricular activities. Only extract answers from the resume, do not make up answers")
 
 
+@lru_cache(maxsize=None)
 def get_skills_format_instructions():
     return """Return a JSON object with the following structure:
 {
@@ -115,26 +123,19 @@ def get_skills_format_instructions():
 }"""
 
 
-skills_template = f"""
-Extract the information:
-
-* Skills section contains technical skills, programming languages, IT tools, software skills.
-* Professional development section contains the list of certifications other than university degrees, research publications, awards, open source contributions or patents.
-* Other section is for language skills, interests, hobbies, extra-curricular activities.
+skills_template = RESUME_BLOCK + f"""Extract skills and related information from the resume:
 
-Only extract answers from the resume, do not make up answers.
+* Skills: technical skills, programming languages, IT tools, software skills.
+* Professional Development: certifications, research publications, awards, open source contributions, patents.
+* Other: language skills, interests, hobbies, extra-curricular activities.
 
-RESUME:
-{{resume}}
+Only extract information that is explicitly mentioned in the resume.
 
-{get_skills_format_instructions()}
+{escape_braces(get_skills_format_instructions())}
 """
 
 
-fallback_skills_prompt = """
-What are the skills in this resume?
-RESUME:
-{resume}
+fallback_skills_prompt = RESUME_BLOCK + """What are the skills in this resume?
 
 Answer with a comma separated list.
 """
@@ -150,48 +151,64 @@ class Education(BaseModel):
     year: Optional[str] = Field(description="year when the qualification was obtained")
 
 
+@lru_cache(maxsize=None)
 def get_education_format_instructions():
     return """Return a JSON array of education objects with the following structure:
 [
-    {{
+    {
         "qualification": "string",
         "establishment": "string (optional)",
         "country": "string (optional)",
         "year": "string (optional)"
-    }}
+    }
 ]"""
 
 
 # Prompt Template to extract education degrees in a structured output
-fallback_education_prompt = """
-What are the university education degrees? Use the template to format the answer. Only use the resume to answer, do not make up answers. If there is no education mentioned in the resume, just answer with 'None'
+fallback_education_prompt = RESUME_BLOCK + """What are the university education degrees? Use the template to format the answer. Only use the resume to answer, do not make up answers. If there is no education mentioned in the resume, just answer with 'None'
 
 TEMPLATE:
 Qualification, Name of establishment, Country (if applicable), Year
 Qualification, Name of establishment, Country (if applicable), Year
 
-RESUME:
-{resume}
-
 ANSWER:
 """
 
 
 # --------------------------------------------------------------------------------------------------------------- #
-# Simple prompt functions that return formatted strings
-def create_basic_details_prompt(resume_text):
-    return f"""
-Extract the basic information from the resume and return as JSON with the following structure:
-{get_basic_info_format_instructions()}
+# msgspec mirrors of the schemas validated after extraction. msgspec validates and converts
+# the model's JSON output much faster than pydantic, so it is used when installed.
+if msgspec is not None:
+    class WorkExperienceStruct(msgspec.Struct):
+        company_name: str
+        job_title: str
+        start_date: str
+        end_date: str
+        description: Optional[str]
 
-Resume:
-{resume_text}
-"""
 
+    class EducationStruct(msgspec.Struct):
+        qualification: str
+        establishment: Optional[str]
+        country: Optional[str]
+        year: Optional[str]
 
-def create_skills_prompt(resume_text):
-    return f"""
-Extract skills and related information from the resume:
+
+    STRUCTS = {WorkExperience: WorkExperienceStruct, Education: EducationStruct}
+else:
+    STRUCTS = {}
+
+
+# --------------------------------------------------------------------------------------------------------------- #
+# Simple prompt functions that return formatted strings.
+# The templates are assembled once at import, so each call only formats in the resume.
+# Basic info, skills and work experience reuse the section templates defined above.
+_EDUCATION_TMPL = RESUME_BLOCK + f"""Extract education information from the resume.
+
+{escape_braces(get_education_format_instructions())}
+"""
+
+_COMBINED_TMPL = RESUME_BLOCK + """Extract the basic information, skills, education and work experience from the resume.
 
 * Skills: technical skills, programming languages, IT tools, software skills.
 * Professional Development: certifications, research publications, awards, open source contributions, patents.
@@ -199,30 +216,57 @@ Extract skills and related information from the resume:
 
 Only extract information that is explicitly mentioned in the resume.
 
-{get_skills_format_instructions()}
-
-Resume:
-{resume_text}
+Return a JSON object with the following structure:
+{{
+    "basic_info": {{
+        "name": "string",
+        "bio": "string",
+        "job_title": "string",
+        "location": "string (optional)",
+        "phone": "string (optional)"
+    }},
+    "skills": {{
+        "skills": ["list", "of", "skills"],
+        "professional_development": ["list", "of", "certifications", "awards"],
+        "other": ["list", "of", "languages", "hobbies"]
+    }},
+    "education": [
+        {{
+            "qualification": "string",
+            "establishment": "string (optional)",
+            "country": "string (optional)",
+            "year": "string (optional)"
+        }}
+    ],
+    "work_experience": [
+        {{
+            "company_name": "string",
+            "job_title": "string",
+            "start_date": "string",
+            "end_date": "string",
+            "description": "string (optional)"
+        }}
+    ]
+}}
 """
 
 
-def create_work_experience_prompt(company, role, resume_text):
-    return f"""
-Extract work experience information for {company} as {role}.
+def create_basic_details_prompt(resume_text):
+    return basic_details_prompt.format(resume=resume_text)
 
-{get_work_experience_format_instructions()}
 
-Resume:
-{resume_text}
-"""
+def create_skills_prompt(resume_text):
+    return skills_template.format(resume=resume_text)
+
+
+def create_work_experience_prompt(company, role, resume_text):
+    return work_experience_template.format(company=company, role=role, resume=resume_text)
 
 
 def create_education_prompt(resume_text):
-    return f"""
-Extract education information from the resume.
+    return _EDUCATION_TMPL.format(resume=resume_text)
 
-{get_education_format_instructions()}
 
-Resume:
-{resume_text}
-"""
\ No newline at end of file
+def create_combined_prompt(resume_text):
+    """Single prompt covering every section, so the resume is sent once instead of four times"""
+    return _COMBINED_TMPL.format(resume=resume_text)
@@ -1,22 +1,58 @@
+import asyncio
 import os
-from openai import OpenAI
+import time
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from pydantic_models_prompts import (
+    create_basic_details_prompt, create_skills_prompt,
+    create_work_experience_prompt, create_education_prompt
+)
+
 load_dotenv()
 
 api_key = os.getenv('OPENAI_API_KEY')
 print(f"API Key found: {bool(api_key)}")
 print(f"API Key starts with: {api_key[:10]}..." if api_key else "No API key")
 
+SAMPLE_RESUME = """Jane Doe
+Software Engineer, London
+Experience: Acme Ltd, Backend Developer, 2019 - 2023
+Skills: Python, SQL, Docker
+Education: BSc Computer Science, University of Leeds, UK, 2019
+"""
+
+
+async def extract(client, prompt):
+    return await client.chat.completions.create(
+        model="gpt-3.5-turbo-1106",
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"},
+        max_tokens=200
+    )
+
+
+async def main():
+    client = AsyncOpenAI(api_key=api_key)
+
+    # Same four section calls the parser makes for one resume, sent concurrently
+    prompts = {
+        "basic_info": create_basic_details_prompt(SAMPLE_RESUME),
+        "skills": create_skills_prompt(SAMPLE_RESUME),
+        "work": create_work_experience_prompt("Acme Ltd", "Backend Developer", SAMPLE_RESUME),
+        "education": create_education_prompt(SAMPLE_RESUME),
+    }
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(extract(client, prompt) for prompt in prompts.values()))
+    print(f"API test successful! {len(responses)} concurrent calls took {time.perf_counter() - start:.2f} seconds")
+
+    for section, response in zip(prompts, responses):
+        print(f"{section}: {response.choices[0].message.content}")
+
+
 # Test the API
 try:
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": "Say 'Hello World'"}],
-        max_tokens=10
-    )
-    print("API test successful!")
-    print(response.choices[0].message.content)
+    asyncio.run(main())
 except Exception as e:
-    print(f"API test failed: {e}")
\ No newline at end of file
+    print(f"API test failed: {e}")
@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+from parser import ResumeManager, apply_combined_output, is_combined_output
+from utils import make_output_template
+
+
+def make_manager(reply):
+    """ResumeManager with a canned combined reply and no OpenAI client"""
+    manager = ResumeManager.__new__(ResumeManager)
+    manager.output = make_output_template()
+    manager.resume = "Jane Doe\nDeveloper\njane@example.com"
+    manager.validate = False
+    manager.fallback_calls = 0
+
+    async def query_model(query, json_mode=True):
+        return reply, 0.0
+
+    async def process_file():
+        manager.fallback_calls += 1
+
+    manager.query_model = query_model
+    manager._process_file = process_file
+    return manager
+
+
+class CombinedOutputTest(unittest.TestCase):
+    def test_flat_reply_is_rejected(self):
+        self.assertFalse(is_combined_output({"name": "Jane", "job_title": "Dev"}))
+
+    def test_wrong_section_type_is_rejected(self):
+        self.assertFalse(is_combined_output({"basic_info": {"name": "Jane"}, "skills": ["Python"]}))
+
+    def test_partial_reply_is_accepted(self):
+        self.assertTrue(is_combined_output({"basic_info": {"name": "Jane"}, "education": []}))
+
+    def test_flat_reply_falls_back_to_section_calls(self):
+        manager = make_manager('{"name": "Jane", "job_title": "Dev"}')
+        asyncio.run(manager._process_file_batched())
+        self.assertEqual(manager.fallback_calls, 1)
+
+    def test_combined_reply_is_applied(self):
+        manager = make_manager('{"basic_info": {"name": "Jane", "job_title": "Dev"}, "skills": {"skills": ["Python"]}}')
+        asyncio.run(manager._process_file_batched())
+        self.assertEqual(manager.fallback_calls, 0)
+        self.assertEqual(manager.output["candidate_name"], "Jane")
+        self.assertEqual(manager.output["skills"], ["Python"])
+        self.assertEqual(manager.output["contact_info"]["email_address"], ["jane@example.com"])
+
+    def test_combined_entries_are_coerced_to_schema(self):
+        output = make_output_template()
+        combined = {
+            "education": [{"qualification": "BSc", "establishment": "Leeds", "country": "UK", "year": "2019", "grade": "First"}],
+            "work_experience": [{"company_name": "Acme", "job_title": "Dev", "start_date": "2019", "end_date": "2023"}],
+        }
+        apply_combined_output(output, combined, "")
+        self.assertEqual(output["education"], [{"qualification": "BSc", "establishment": "Leeds", "country": "UK", "year": "2019"}])
+        self.assertEqual(output["work_output"][0]["description"], None)
+
+    def test_combined_entries_are_validated_when_requested(self):
+        output = make_output_template()
+        combined = {"education": [{"qualification": "BSc", "establishment": None, "country": None, "year": None}, {"year": "2019"}]}
+        apply_combined_output(output, combined, "", validate=True)
+        self.assertEqual([entry["qualification"] for entry in output["education"]], ["BSc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import re
+import sys
+import unittest
+
+import utils
+
+# Fragments mixing contacts with the Unicode digits, spaces and letters the Hyperscan prefilter must widen for
+FRAGMENTS = (
+    'jane.doe@example.com', '_jane@example.co.uk', '.x@mail.org', 'café@exemple.fr',
+    'https://github.com/jane-doe', 'linkedin.com/in/jane', 'https://www.jane.dev/blog', 'www.jane.io',
+    '555-123-4567', '+44 20 7946 0958', '(555) 123 4567', '５５５-１２３-４５６７', '٥٥٥١٢٣٤٥٦٧',
+    '555\u00a0123\u00a04567', '555\u2009123\u30004567', '+1.555.123.4567', '12345', '2019 - 2023',
+    'Python', 'Zoë', '東京', 'Software Engineer', 'a', '_', '@', '.', '-', '(', ')', '+', '/', ':',
+    ' ', '  ', '\n', '\t', '\u00a0', '\u3000', '0', '7', '٣', '９',
+)
+
+
+def random_text(rng):
+    return ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30)))
+
+
+class PhoneExtractionTest(unittest.TestCase):
+    def test_phone_extractors_agree(self):
+        text = 'Call 555-123-4567 or +44 (020) 123-4567'
+        self.assertEqual(utils.extract_phone_numbers(text), ['5551234567', '+440201234567'])
+        self.assertEqual(utils.extract_phone_numbers(text), utils.extract_all_contact_info(text)['phone_numbers'])
+
+
+class HyperscanClassesTest(unittest.TestCase):
+    def test_digit_span_covers_unicode_digits(self):
+        low, high = (int(code, 16) for code in re.findall(r'\\x\{([0-9a-f]+)\}', utils._HS_DIGITS))
+        digits = [code for code in range(0x80, sys.maxunicode + 1) if chr(code).isdecimal()]
+        self.assertGreaterEqual(digits[0], low)
+        self.assertLessEqual(digits[-1], high)
+
+    def test_spaces_match_python_whitespace(self):
+        spaces = re.compile('[' + re.sub(r'\\x\{([0-9a-f]+)\}', lambda m: '\\U%08x' % int(m.group(1), 16), utils._HS_SPACES) + ']')
+        expected = {code for code in range(sys.maxunicode + 1) if chr(code).isspace()}
+        self.assertEqual({code for code in range(0x3001) if spaces.match(chr(code))}, expected)
+
+
+@unittest.skipIf(utils.hyperscan is None, "hyperscan is not installed")
+class HyperscanContactScanTest(unittest.TestCase):
+    def test_matches_regex_scan(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = random_text(rng)
+            self.assertEqual(list(utils._scan_contacts_hyperscan(text)), list(utils._scan_contacts(text)), repr(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
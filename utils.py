@@ -1,24 +1,50 @@
 import re
 import json
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Tuple
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+def make_output_template() -> Dict[str, Any]:
+    """
+    Build a fresh output structure (cheaper than deep-copying output_template).
+    
+    Returns:
+        Dict[str, Any]: Empty output data with new nested dicts and lists
+    """
+    return {
+        'candidate_name': '',
+        'contact_info': {
+            'location': '',
+            'phone_number': '',
+            'email_address': [],
+            'personal_urls': []
+        },
+        'job_title': '',
+        'bio': '',
+        'work_output': [],
+        'skills': [],
+        'education': [],
+        'professional_development': [],  # list of certifications, research publications, awards, open source contributions
+        'other_info': [],  # list of language skills, interests, hobbies, extracurricular activities
+    }
+
 
 # Output template structure
-output_template = {
-    'candidate_name': '',
-    'contact_info': {
-        'location': '',
-        'phone_number': '',
-        'email_address': [],
-        'personal_urls': []
-    },
-    'job_title': '',
-    'bio': '',
-    'work_output': [],
-    'skills': [],
-    'education': [],
-    'professional_development': [],  # list of certifications, research publications, awards, open source contributions
-    'other_info': [],  # list of language skills, interests, hobbies, extracurricular activities
-}
+output_template = make_output_template()
 
 
 # Template structures for specific sections
@@ -44,6 +70,98 @@ personal_website_pattern = r'(https?://(?!github\.com|linkedin\.com)[A-Za-z0-9.-
 email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
 phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
 
+# Patterns run on every resume are compiled once, with RE2's linear-time engine when
+# google-re2 is installed (they only use syntax RE2 supports)
+_fast_re = re2 if re2 is not None else re
+_EMAIL_RE = _fast_re.compile('(?i)' + email_pattern)
+_GITHUB_RE = _fast_re.compile(github_pattern)
+_LINKEDIN_RE = _fast_re.compile(linkedin_pattern)
+_PERSONAL_WEBSITE_RE = re.compile(personal_website_pattern)
+_PHONE_RE = re.compile(phone_pattern)
+# Deletes phone number separators (dashes, dots, brackets and any whitespace \s matches) in one C-level pass
+_PHONE_SEPARATORS = str.maketrans('', '', '-.()' + ''.join(c for c in map(chr, range(0x3001)) if c.isspace()))
+_WS_RE = re.compile(r'\s+')
+# Runs of whitespace and non-ASCII characters, replaced by one space in a single pass
+_CLEAN_RE = re.compile(r'(?:\s|[^\x00-\x7F])+')
+
+# All contact patterns fused into one alternation so extract_all_contact_info scans the text once.
+# Profile URLs come before the generic website branch so they are not reported twice.
+_CONTACT_RE = re.compile(
+    f'(?P<github>{github_pattern})'
+    f'|(?P<linkedin>{linkedin_pattern})'
+    f'|(?P<personal>{personal_website_pattern})'
+    f'|(?P<email>(?i:{email_pattern}))'
+    f'|(?P<phone>{phone_pattern})'
+)
+
+# Resume section headings, each mapped to the section it starts. A heading must sit on its own line.
+_SECTION_HEADINGS = {
+    'work experience': 'work',
+    'professional experience': 'work',
+    'employment history': 'work',
+    'employment': 'work',
+    'experience': 'work',
+    'education': 'education',
+    'academic background': 'education',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'projects': 'projects',
+    'certifications': 'certifications',
+    'awards': 'awards',
+    'publications': 'publications',
+    'languages': 'languages',
+    'interests': 'interests',
+    'summary': 'summary',
+    'profile': 'summary',
+}
+_SECTION_HEADER_RE = re.compile(
+    r'(?im)^[ \t]*(' + '|'.join(sorted(map(re.escape, _SECTION_HEADINGS), key=len, reverse=True)) + r')[ \t]*:?[ \t]*$'
+)
+
+# Hyperscan prefilter for _CONTACT_RE. Hyperscan has no lookahead, so the website pattern drops
+# it; the database only finds the regions where contacts can occur and _CONTACT_RE confirms them.
+# Hyperscan's \d and \s are ASCII-only (and HS_FLAG_UCP rejects \b), while Python's also match Unicode
+# digits and whitespace such as full-width digits or non-breaking spaces. The phone pattern gets wider
+# classes instead: 0-9 plus the span from the first to the last non-ASCII decimal digit (an exact class
+# makes the database too large), and every code point str.isspace() accepts, spliced into its [-.\s].
+_HS_DIGITS = r'[0-9\x{660}-\x{1fbf9}]'
+_HS_SPACES = r'\x{9}-\x{d}\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}'
+
+
+@lru_cache(maxsize=None)
+def _contact_hyperscan_db() -> "hyperscan.Database":
+    """
+    Compile the contact patterns into one Hyperscan database reporting leftmost match starts.
+    Built on first use, so importing utils stays cheap.
+    
+    Returns:
+        hyperscan.Database: The compiled database, or None when hyperscan is not installed
+    """
+    if hyperscan is None:
+        return None
+    patterns = (
+        github_pattern,
+        linkedin_pattern,
+        r'https?://[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}(?:/[^\s]*)?',
+        # Hyperscan's \b is ASCII-only, so the email's leading \b is dropped: Python's Unicode \b lets an
+        # email start with punctuation right after a non-ASCII letter or digit, which Hyperscan would miss
+        email_pattern.replace('\\b', '', 1),
+        phone_pattern.replace('\\d', _HS_DIGITS).replace('\\s', _HS_SPACES),
+    )
+    flags = hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pattern.encode() for pattern in patterns],
+        ids=list(range(len(patterns))),
+        elements=len(patterns),
+        flags=[flags, flags, flags, flags | hyperscan.HS_FLAG_CASELESS, flags],
+    )
+    return db
+
+
+# Domains that are never reported as personal websites
+_BAD_DOMAIN_RE = re.compile(r'(?:facebook|twitter|instagram|youtube)\.com', re.IGNORECASE)
+
 
 def extract_emails(content: str) -> List[str]:
     """
@@ -55,15 +173,12 @@ def extract_emails(content: str) -> List[str]:
     Returns:
         List[str]: List of unique email addresses found
     """
-    emails = re.findall(email_pattern, content, re.IGNORECASE)
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_emails = []
+    emails = _EMAIL_RE.findall(content)
+    # Remove case-insensitive duplicates while preserving order and the first spelling
+    unique_emails = {}
     for email in emails:
-        if email.lower() not in seen:
-            seen.add(email.lower())
-            unique_emails.append(email)
-    return unique_emails
+        unique_emails.setdefault(email.lower(), email)
+    return list(unique_emails.values())
 
 
 def extract_github_and_linkedin_urls(text: str) -> List[str]:
@@ -76,19 +191,11 @@ def extract_github_and_linkedin_urls(text: str) -> List[str]:
     Returns:
         List[str]: List of unique GitHub and LinkedIn URLs found
     """
-    github_urls = re.findall(github_pattern, text)
-    linkedin_urls = re.findall(linkedin_pattern, text)
-    
-    # Combine and remove duplicates
-    all_urls = github_urls + linkedin_urls
-    seen = set()
-    unique_urls = []
-    for url in all_urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append(url)
+    github_urls = _GITHUB_RE.findall(text)
+    linkedin_urls = _LINKEDIN_RE.findall(text)
     
-    return unique_urls
+    # Combine and remove duplicates while preserving order
+    return list(dict.fromkeys(github_urls + linkedin_urls))
 
 
 def extract_personal_urls(text: str) -> List[str]:
@@ -101,19 +208,11 @@ def extract_personal_urls(text: str) -> List[str]:
     Returns:
         List[str]: List of personal website URLs
     """
-    websites = re.findall(personal_website_pattern, text)
+    websites = _PERSONAL_WEBSITE_RE.findall(text)
     # Filter out common non-personal sites and duplicates
-    common_domains = ['facebook.com', 'twitter.com', 'instagram.com', 'youtube.com']
-    seen = set()
-    personal_urls = []
-    
-    for url in websites:
-        if not any(domain in url for domain in common_domains):
-            if url not in seen:
-                seen.add(url)
-                personal_urls.append(url)
-    
-    return personal_urls
+    return list(dict.fromkeys(
+        url for url in websites if not _BAD_DOMAIN_RE.search(url)
+    ))
 
 
 def extract_phone_numbers(content: str) -> List[str]:
@@ -126,12 +225,11 @@ def extract_phone_numbers(content: str) -> List[str]:
     Returns:
         List[str]: List of phone numbers found
     """
-    phones = re.findall(phone_pattern, content)
-    # Clean up the phone numbers
+    # findall would return only the country-code group, so take each whole match
     cleaned_phones = []
-    for phone in phones:
+    for match in _PHONE_RE.finditer(content):
         # Remove common separators and extra spaces
-        cleaned = re.sub(r'[-.\s()]', '', phone).strip()
+        cleaned = match.group(0).translate(_PHONE_SEPARATORS)
         if len(cleaned) >= 10:  # Basic validation for phone number length
             cleaned_phones.append(cleaned)
     
@@ -148,14 +246,9 @@ def clean_text_content(text: str) -> str:
     Returns:
         str: Cleaned and normalized text
     """
-    # Remove extra whitespace and normalize line breaks
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n', '\n', text)
-    
-    # Remove special characters that might interfere with parsing
-    text = re.sub(r'[^\x00-\x7F]+', ' ', text)  # Remove non-ASCII characters
-    
-    return text.strip()
+    # Collapse whitespace and line breaks, and remove non-ASCII characters that might
+    # interfere with parsing, in one pass over the text
+    return _CLEAN_RE.sub(' ', text).strip()
 
 
 def validate_email_format(output_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -192,20 +285,18 @@ def format_work_experience(work_data: List[Dict[str, Any]]) -> List[Dict[str, An
     formatted_work = []
     
     for work in work_data:
-        formatted_entry = work_experience_template.copy()
+        # Clean up description text
+        description = work.get('description') or ''
+        if isinstance(description, str):
+            description = _WS_RE.sub(' ', description).strip()
         
-        # Map fields from raw data to template
-        for key in formatted_entry.keys():
-            if key in work and work[key]:
-                formatted_entry[key] = work[key]
-            elif key == 'description' and work.get(key):
-                # Clean up description text
-                desc = work[key]
-                if isinstance(desc, str):
-                    desc = re.sub(r'\s+', ' ', desc).strip()
-                formatted_entry[key] = desc
-        
-        formatted_work.append(formatted_entry)
+        formatted_work.append({
+            'company_name': work.get('company_name') or '',
+            'job_title': work.get('job_title') or '',
+            'start_date': work.get('start_date') or '',
+            'end_date': work.get('end_date') or '',
+            'description': description,
+        })
     
     return formatted_work
 
@@ -220,21 +311,34 @@ def format_education(education_data: List[Dict[str, Any]]) -> List[Dict[str, Any
     Returns:
         List[Dict[str, Any]]: Formatted education data
     """
-    formatted_education = []
-    
-    for edu in education_data:
-        formatted_entry = education_template.copy()
-        
-        # Map fields from raw data to template
-        for key in formatted_entry.keys():
-            if key in edu and edu[key]:
-                formatted_entry[key] = edu[key]
-        
-        formatted_education.append(formatted_entry)
+    formatted_education = [
+        {
+            'qualification': edu.get('qualification') or '',
+            'establishment': edu.get('establishment') or '',
+            'country': edu.get('country') or '',
+            'year': edu.get('year') or '',
+        }
+        for edu in education_data
+    ]
     
     return formatted_education
 
 
+def _as_list(value: Any) -> List[Any]:
+    """
+    Wrap a single value in a list, mapping empty values to an empty list.
+    
+    Args:
+        value (Any): A list or a single value
+        
+    Returns:
+        List[Any]: The value as a list
+    """
+    if isinstance(value, list):
+        return value
+    return [value] if value else []
+
+
 def sanitize_output(output_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Sanitize and clean the final output data.
@@ -245,28 +349,28 @@ def sanitize_output(output_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Sanitized output data
     """
-    # Create a deep copy to avoid modifying original
-    sanitized = output_template.copy()
-    
-    # Copy all fields that exist in both templates
-    for key in sanitized.keys():
-        if key in output_data and output_data[key] is not None:
-            if key == 'contact_info' and isinstance(output_data[key], dict):
-                # Handle nested contact_info
-                for contact_key in sanitized['contact_info'].keys():
-                    if contact_key in output_data['contact_info'] and output_data['contact_info'][contact_key]:
-                        sanitized['contact_info'][contact_key] = output_data['contact_info'][contact_key]
-            else:
-                sanitized[key] = output_data[key]
-    
-    # Ensure lists are properly formatted
-    list_fields = ['skills', 'professional_development', 'other_info', 'work_output', 'education']
-    for field in list_fields:
-        if field in sanitized and not isinstance(sanitized[field], list):
-            if sanitized[field]:
-                sanitized[field] = [sanitized[field]]
-            else:
-                sanitized[field] = []
+    # Build a new dict rather than copying output_template, whose nested dict and lists would be shared
+    contact_info = output_data.get('contact_info')
+    if not isinstance(contact_info, dict):
+        contact_info = {}
+    
+    sanitized = {
+        'candidate_name': output_data.get('candidate_name') or '',
+        'contact_info': {
+            'location': contact_info.get('location') or '',
+            'phone_number': contact_info.get('phone_number') or '',
+            'email_address': contact_info.get('email_address') or [],
+            'personal_urls': contact_info.get('personal_urls') or [],
+        },
+        'job_title': output_data.get('job_title') or '',
+        'bio': output_data.get('bio') or '',
+        # Ensure lists are properly formatted
+        'work_output': _as_list(output_data.get('work_output')),
+        'skills': _as_list(output_data.get('skills')),
+        'education': _as_list(output_data.get('education')),
+        'professional_development': _as_list(output_data.get('professional_development')),
+        'other_info': _as_list(output_data.get('other_info')),
+    }
     
     # Validate email format
     sanitized = validate_email_format(sanitized)
@@ -274,7 +378,8 @@ def sanitize_output(output_data: Dict[str, Any]) -> Dict[str, Any]:
     return sanitized
 
 
-def save_output_to_file(output_data: Dict[str, Any], filename: str, output_dir: str = "parsed_outputs") -> str:
+def save_output_to_file(output_data: Dict[str, Any], filename: str, output_dir: str = "parsed_outputs",
+                        sanitize: bool = True) -> str:
     """
     Save parsed output to a JSON file.
     
@@ -282,6 +387,7 @@ def save_output_to_file(output_data: Dict[str, Any], filename: str, output_dir:
         output_data (Dict[str, Any]): The parsed resume data
         filename (str): Base filename for output
         output_dir (str): Output directory name
+        sanitize (bool): Whether to sanitize the data first, False if it already went through sanitize_output
         
     Returns:
         str: Path to the saved file
@@ -296,15 +402,63 @@ def save_output_to_file(output_data: Dict[str, Any], filename: str, output_dir:
     output_path = os.path.join(output_dir, f"{filename}_output.json")
     
     # Sanitize data before saving
-    sanitized_data = sanitize_output(output_data)
+    sanitized_data = sanitize_output(output_data) if sanitize else output_data
     
-    # Save to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(sanitized_data, f, indent=2, ensure_ascii=False)
+    # Save to file, serialized in one go and written with a single call
+    Path(output_path).write_bytes(_dump_output(sanitized_data))
     
     return output_path
 
 
+def _dump_output(output_data: Dict[str, Any]) -> bytes:
+    """
+    Serialize output data to indented UTF-8 JSON, with orjson when it is installed.
+    
+    Args:
+        output_data (Dict[str, Any]): The parsed resume data
+        
+    Returns:
+        bytes: JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(output_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(output_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def save_output_to_file_batch(items: List[Tuple[str, Dict[str, Any]]], output_dir: str = "parsed_outputs",
+                              sanitize: bool = True, max_workers: int = 8) -> List[str]:
+    """
+    Save many parsed outputs, overlapping the file writes on a thread pool.
+    
+    Args:
+        items (List[Tuple[str, Dict[str, Any]]]): (base filename, parsed resume data) pairs
+        output_dir (str): Output directory name
+        sanitize (bool): Whether to sanitize the data first
+        max_workers (int): Maximum number of files written at once
+        
+    Returns:
+        List[str]: Paths to the saved files, in the order of items
+    """
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+    
+    # Create output directory once for the whole batch
+    Path(output_dir).mkdir(exist_ok=True)
+    
+    # Serialize up front, the writes then release the GIL and run concurrently
+    payloads = [
+        (os.path.join(output_dir, f"{filename}_output.json"),
+         _dump_output(sanitize_output(output_data) if sanitize else output_data))
+        for filename, output_data in items
+    ]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda payload: Path(payload[0]).write_bytes(payload[1]), payloads))
+    
+    return [output_path for output_path, _ in payloads]
+
+
 def load_output_from_file(filepath: str) -> Dict[str, Any]:
     """
     Load parsed output from a JSON file.
@@ -319,6 +473,88 @@ def load_output_from_file(filepath: str) -> Dict[str, Any]:
         return json.load(f)
 
 
+def extract_section_snippet(text: str, section: str) -> str:
+    """
+    Extract the parts of a resume under the headings of one section.
+    
+    Args:
+        text (str): The resume text content
+        section (str): Section name, e.g. 'work', 'education' or 'skills'
+        
+    Returns:
+        str: Text of every matching section including its heading, or the whole
+        text when no heading for the section is found
+    """
+    headers = list(_SECTION_HEADER_RE.finditer(text))
+    snippets = []
+    
+    for i, header in enumerate(headers):
+        if _SECTION_HEADINGS[header.group(1).lower()] == section:
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+            snippets.append(text[header.start():end].strip())
+    
+    return '\n\n'.join(snippets) if snippets else text
+
+
+def _scan_contacts(content: str) -> Iterator[Tuple[str, str]]:
+    """
+    Scan text once with the fused contact regex.
+    
+    Args:
+        content (str): The resume text content
+        
+    Yields:
+        Tuple[str, str]: (kind, matched text) pairs in text order
+    """
+    for match in _CONTACT_RE.finditer(content):
+        yield match.lastgroup, match.group(match.lastgroup)
+
+
+def _scan_contacts_hyperscan(content: str) -> Iterator[Tuple[str, str]]:
+    """
+    Scan text once with the Hyperscan contact database, then run _CONTACT_RE only over
+    the regions it matched, giving the same matches as _scan_contacts.
+    
+    Args:
+        content (str): The resume text content
+        
+    Yields:
+        Tuple[str, str]: (kind, matched text) pairs in text order
+    """
+    data = content.encode('utf-8')
+    spans = []
+    _contact_hyperscan_db().scan(data, match_event_handler=lambda pattern_id, start, end, flags, context: spans.append((start, end)))
+    
+    # Merge overlapping matches into regions
+    regions = []
+    for start, end in sorted(spans):
+        if regions and start <= regions[-1][1]:
+            start, previous_end = regions.pop()
+            end = max(end, previous_end)
+        regions.append((start, end))
+    
+    # Convert each region to character offsets, decoding only the bytes since the previous one
+    position = 0
+    byte_offset = char_offset = 0
+    for start, end in regions:
+        char_start = char_offset + len(data[byte_offset:start].decode('utf-8'))
+        char_end = char_start + len(data[start:end].decode('utf-8'))
+        byte_offset, char_offset = end, char_end
+        
+        position = max(position, char_start)
+        while position < char_end:
+            candidate = _CONTACT_RE.search(content, position, char_end)
+            if candidate is None:
+                break
+            # Confirm against the whole text, since a word boundary may fall at char_end
+            match = _CONTACT_RE.match(content, candidate.start())
+            if match is None:
+                position = candidate.start() + 1
+                continue
+            position = match.end()
+            yield match.lastgroup, match.group(match.lastgroup)
+
+
 def extract_all_contact_info(content: str) -> Dict[str, List[str]]:
     """
     Extract all contact information from resume content.
@@ -329,11 +565,33 @@ def extract_all_contact_info(content: str) -> Dict[str, List[str]]:
     Returns:
         Dict[str, List[str]]: Dictionary containing all extracted contact info
     """
+    found = {'github': [], 'linkedin': [], 'personal': [], 'email': [], 'phone': []}
+    seen = set()
+    matches = _scan_contacts_hyperscan(content) if _contact_hyperscan_db() is not None else _scan_contacts(content)
+    
+    for kind, value in matches:
+        if kind == 'email':
+            key = value.lower()
+        elif kind == 'phone':
+            value = value.translate(_PHONE_SEPARATORS)
+            if len(value) < 10:  # Basic validation for phone number length
+                continue
+            key = value
+        elif kind == 'personal' and _BAD_DOMAIN_RE.search(value):
+            continue
+        else:
+            key = value
+        
+        # Remove duplicates while preserving order
+        if (kind, key) not in seen:
+            seen.add((kind, key))
+            found[kind].append(value)
+    
     return {
-        'emails': extract_emails(content),
-        'github_linkedin_urls': extract_github_and_linkedin_urls(content),
-        'personal_urls': extract_personal_urls(content),
-        'phone_numbers': extract_phone_numbers(content)
+        'emails': found['email'],
+        'github_linkedin_urls': found['github'] + found['linkedin'],
+        'personal_urls': found['personal'],
+        'phone_numbers': found['phone']
     }
 
 